@@ -1,23 +1,73 @@
 import os
+import re
+import logging
+import time
+import bson
+import orjson
+from contextlib import asynccontextmanager
 from typing import List, Optional
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
+from bson.errors import InvalidId
 from bson.objectid import ObjectId
 
-from database import db, create_document, get_documents
+from database import db, create_document, find_documents, get_documents
 from schemas import Course, Lesson, Enrollment
 
-app = FastAPI(title="E-learning API")
+logger = logging.getLogger(__name__)
+
+# ObjectId/BSON handling falls back to pure Python (several times slower)
+# when pymongo is installed without its C extension
+if not bson.has_c():
+    logger.warning("bson C extension not available; install a binary pymongo wheel")
+
+# Set once the course text index exists; course search falls back to $regex otherwise
+text_search_enabled = False
+
+async def create_indexes():
+    global text_search_enabled
+    if db is None:
+        return
+    try:
+        # Text index backs the `search` filter of list_courses
+        await db["course"].create_index([("title", "text"), ("description", "text")])
+        text_search_enabled = True
+        # Compound index serves both the course_id filter and the order sort of list_lessons
+        await db["lesson"].create_index([("course_id", 1), ("order", 1)])
+        # Superseded by the compound index above; drop it where an older startup created it
+        if "course_id_1" in await db["lesson"].index_information():
+            await db["lesson"].drop_index("course_id_1")
+    except Exception as e:
+        logger.warning("Could not create indexes: %s", e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await create_indexes()
+    yield
+
+app = FastAPI(title="E-learning API", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    # Comma-separated list of allowed origins; defaults to any origin
+    allow_origins=[o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip()],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
+    # Let browsers cache preflight responses for a day
+    max_age=86400,
 )
 
+# Compress larger JSON payloads (course/lesson lists); small responses pass through
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Response models are only used to document the list endpoints in OpenAPI;
+# the handlers build their own responses (ORJSONResponse / streamed JSON),
+# skipping response validation.
+
 class CourseResponse(BaseModel):
     id: str
     title: str
@@ -39,11 +89,23 @@ class LessonResponse(BaseModel):
     order: int
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "E-learning Backend is running"}
 
+# Cached result of db.list_collection_names() as (monotonic timestamp, names)
+COLLECTIONS_CACHE_TTL = 30
+_collections_cache = (0.0, None)
+
+async def list_collections_cached():
+    global _collections_cache
+    ts, collections = _collections_cache
+    if collections is None or time.monotonic() - ts > COLLECTIONS_CACHE_TTL:
+        collections = await db.list_collection_names()
+        _collections_cache = (time.monotonic(), collections)
+    return collections
+
 @app.get("/test")
-def test_database():
+async def test_database():
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
@@ -59,7 +121,7 @@ def test_database():
             response["database_name"] = db.name
             response["connection_status"] = "Connected"
             try:
-                collections = db.list_collection_names()
+                collections = await list_collections_cached()
                 response["collections"] = collections[:10]
                 response["database"] = "✅ Connected & Working"
             except Exception as e:
@@ -73,75 +135,142 @@ def test_database():
     response["database_name"] = "✅ Set" if os.getenv("DATABASE_NAME") else "❌ Not Set"
     return response
 
+# Fields fetched from Mongo for the list endpoints (_id is always included)
+COURSE_PROJECTION = {
+    "title": 1, "description": 1, "category": 1, "level": 1, "author": 1,
+    "thumbnail_url": 1, "tags": 1, "is_premium": 1, "is_free_access": 1,
+}
+LESSON_PROJECTION = {"course_id": 1, "title": 1, "content": 1, "video_url": 1, "order": 1}
+
 # Helper: convert Mongo document to response dict
 
-def to_course_response(doc) -> CourseResponse:
-    return CourseResponse(
-        id=str(doc.get("_id")),
-        title=doc.get("title"),
-        description=doc.get("description"),
-        category=doc.get("category"),
-        level=doc.get("level"),
-        author=doc.get("author"),
-        thumbnail_url=doc.get("thumbnail_url"),
-        tags=doc.get("tags", []),
-        is_premium=doc.get("is_premium", False),
-        is_free_access=doc.get("is_free_access", True)
-    )
+def to_course_response(doc) -> dict:
+    return {
+        "id": str(doc.get("_id")),
+        "title": doc.get("title"),
+        "description": doc.get("description"),
+        "category": doc.get("category"),
+        "level": doc.get("level"),
+        "author": doc.get("author"),
+        "thumbnail_url": doc.get("thumbnail_url"),
+        "tags": doc.get("tags", []),
+        "is_premium": doc.get("is_premium", False),
+        "is_free_access": doc.get("is_free_access", True),
+    }
+
+
+def to_lesson_response(doc) -> dict:
+    return {
+        "id": str(doc.get("_id")),
+        "course_id": str(doc.get("course_id")),
+        "title": doc.get("title"),
+        "content": doc.get("content"),
+        "video_url": doc.get("video_url"),
+        "order": doc.get("order", 1),
+    }
+
+
+# Documents encoded per chunk of the streamed course list; batching keeps the
+# number of ASGI sends (and GZip passes) low for large catalogs
+STREAM_BATCH_SIZE = 100
+
+async def stream_json_array(first, cursor, to_response):
+    # Encode documents as a JSON array without materializing the whole list
+    batch = [orjson.dumps(to_response(doc)) for doc in first]
+    prefix = b"["
+    async for doc in cursor:
+        batch.append(orjson.dumps(to_response(doc)))
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield prefix + b",".join(batch)
+            prefix = b","
+            batch = []
+    if batch:
+        yield prefix + b",".join(batch) + b"]"
+    else:
+        yield b"[]" if prefix == b"[" else b"]"
 
 
-def to_lesson_response(doc) -> LessonResponse:
-    return LessonResponse(
-        id=str(doc.get("_id")),
-        course_id=str(doc.get("course_id")),
-        title=doc.get("title"),
-        content=doc.get("content"),
-        video_url=doc.get("video_url"),
-        order=doc.get("order", 1)
+def parse_course_id(course_id: str) -> ObjectId:
+    # Single parse instead of ObjectId.is_valid() followed by ObjectId()
+    try:
+        return ObjectId(course_id)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid course_id")
+
+def text_search_terms(search: str) -> str:
+    # Treat user input as plain words: in $text syntax quotes start a phrase
+    # search and a leading "-" excludes a term
+    return " ".join(t.lstrip("-") for t in search.replace('"', " ").split())
+
+
+async def search_courses(filter_dict: dict, search: str):
+    # Whole-word matches through the text index, ranked by relevance. When that
+    # finds nothing (e.g. a partial word like "Pyth") fall back to a prefix match,
+    # and without the text index use the plain substring regex.
+    terms = text_search_terms(search)
+    if text_search_enabled and terms:
+        cursor = find_documents(
+            "course",
+            filter_dict={**filter_dict, "$text": {"$search": terms}},
+            projection={**COURSE_PROJECTION, "score": {"$meta": "textScore"}},
+            sort=[("score", {"$meta": "textScore"})],
+        )
+        first = await cursor.to_list(length=1)
+        if first:
+            return cursor, first
+        pattern = "^" + re.escape(search)
+    else:
+        pattern = re.escape(search)
+    regex = {"$regex": pattern, "$options": "i"}
+    cursor = find_documents(
+        "course",
+        filter_dict={**filter_dict, "$or": [{"title": regex}, {"description": regex}]},
+        projection=COURSE_PROJECTION,
     )
+    return cursor, await cursor.to_list(length=1)
 
 # API: Courses
 
-@app.post("/api/courses", response_model=dict)
-def create_course(course: Course):
+@app.post("/api/courses")
+async def create_course(course: Course):
     try:
-        inserted_id = create_document("course", course)
+        inserted_id = await create_document("course", course)
         return {"id": inserted_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/courses", response_model=List[CourseResponse])
-def list_courses(category: Optional[str] = None, search: Optional[str] = None):
+@app.get("/api/courses", responses={200: {"model": List[CourseResponse]}})
+async def list_courses(category: Optional[str] = None, search: Optional[str] = None):
     try:
         filter_dict = {}
         if category:
             filter_dict["category"] = category
+        # Fetch the first document up front so query errors still surface as a 500
         if search:
-            # Simple text search across title and description
-            filter_dict["$or"] = [
-                {"title": {"$regex": search, "$options": "i"}},
-                {"description": {"$regex": search, "$options": "i"}}
-            ]
-        docs = get_documents("course", filter_dict=filter_dict)
-        return [to_course_response(d) for d in docs]
+            cursor, first = await search_courses(filter_dict, search)
+        else:
+            cursor = find_documents("course", filter_dict=filter_dict, projection=COURSE_PROJECTION)
+            first = await cursor.to_list(length=1)
+        return StreamingResponse(
+            stream_json_array(first, cursor, to_course_response),
+            media_type="application/json",
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # API: Lessons
 
-@app.post("/api/lessons", response_model=dict)
-def create_lesson(lesson: Lesson):
+@app.post("/api/lessons")
+async def create_lesson(lesson: Lesson):
     try:
         # Ensure referenced course exists
-        if not ObjectId.is_valid(lesson.course_id):
-            raise HTTPException(status_code=400, detail="Invalid course_id")
-        course = db["course"].find_one({"_id": ObjectId(lesson.course_id)})
+        course = await db["course"].find_one({"_id": parse_course_id(lesson.course_id)})
         if not course:
             raise HTTPException(status_code=404, detail="Course not found")
 
-        inserted_id = create_document("lesson", lesson)
+        inserted_id = await create_document("lesson", lesson)
         return {"id": inserted_id}
     except HTTPException:
         raise
@@ -149,13 +278,17 @@ def create_lesson(lesson: Lesson):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/courses/{course_id}/lessons", response_model=List[LessonResponse])
-def list_lessons(course_id: str):
+@app.get("/api/courses/{course_id}/lessons", responses={200: {"model": List[LessonResponse]}})
+async def list_lessons(course_id: str):
     try:
-        if not ObjectId.is_valid(course_id):
-            raise HTTPException(status_code=400, detail="Invalid course_id")
-        docs = get_documents("lesson", {"course_id": course_id})
-        return [to_lesson_response(d) for d in docs]
+        parse_course_id(course_id)
+        docs = await get_documents(
+            "lesson",
+            {"course_id": course_id},
+            projection=LESSON_PROJECTION,
+            sort=[("order", 1)],
+        )
+        return ORJSONResponse([to_lesson_response(d) for d in docs])
     except HTTPException:
         raise
     except Exception as e:
@@ -164,15 +297,13 @@ def list_lessons(course_id: str):
 
 # API: Enrollments (free access)
 
-@app.post("/api/enroll", response_model=dict)
-def enroll(enrollment: Enrollment):
+@app.post("/api/enroll")
+async def enroll(enrollment: Enrollment):
     try:
-        if not ObjectId.is_valid(enrollment.course_id):
-            raise HTTPException(status_code=400, detail="Invalid course_id")
-        course = db["course"].find_one({"_id": ObjectId(enrollment.course_id)})
+        course = await db["course"].find_one({"_id": parse_course_id(enrollment.course_id)})
         if not course:
             raise HTTPException(status_code=404, detail="Course not found")
-        inserted_id = create_document("enrollment", enrollment)
+        inserted_id = await create_document("enrollment", enrollment)
         return {"id": inserted_id}
     except HTTPException:
         raise
@@ -182,7 +313,7 @@ def enroll(enrollment: Enrollment):
 
 # Simple seed endpoint to add sample courses quickly (optional helper)
 @app.post("/api/seed")
-def seed_data():
+async def seed_data():
     try:
         samples = [
             {
@@ -208,9 +339,8 @@ def seed_data():
                 "is_free_access": True,
             },
         ]
-        ids = []
-        for s in samples:
-            ids.append(str(db["course"].insert_one({**s}).inserted_id))
+        result = await db["course"].insert_many(samples, ordered=False)
+        ids = [str(i) for i in result.inserted_ids]
         return {"inserted": ids}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -219,4 +349,11 @@ def seed_data():
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
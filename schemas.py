@@ -9,9 +9,18 @@ Each Pydantic model maps to a MongoDB collection with the lowercase class name:
 These are used for validation in API endpoints and by the database viewer.
 """
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 
+
+def check_http_url(value: Optional[str]) -> Optional[str]:
+    """Cheap scheme check used instead of HttpUrl for URL fields"""
+    # Schemes are case-insensitive, as HttpUrl treated them
+    if value is not None and not value[:8].lower().startswith(("http://", "https://")):
+        raise ValueError("URL must start with http:// or https://")
+    return value
+
+
 class Course(BaseModel):
     """
     Courses collection schema
@@ -23,11 +32,16 @@ class Course(BaseModel):
     category: str = Field(..., min_length=2, max_length=60, description="Course category e.g. Programming, Design")
     level: str = Field("Beginner", description="Level: Beginner, Intermediate, Advanced")
     author: str = Field(..., min_length=2, max_length=80, description="Instructor name")
-    thumbnail_url: Optional[HttpUrl] = Field(None, description="Thumbnail image URL")
+    thumbnail_url: Optional[str] = Field(None, max_length=2083, description="Thumbnail image URL")
     tags: List[str] = Field(default_factory=list, description="Searchable tags")
     is_premium: bool = Field(False, description="Originally premium/paid course")
     is_free_access: bool = Field(True, description="Provided free of cost on this platform")
 
+    @field_validator("thumbnail_url")
+    @classmethod
+    def validate_thumbnail_url(cls, value: Optional[str]) -> Optional[str]:
+        return check_http_url(value)
+
 class Lesson(BaseModel):
     """
     Lessons collection schema
@@ -37,9 +51,14 @@ class Lesson(BaseModel):
     course_id: str = Field(..., description="Related course _id as string")
     title: str = Field(..., min_length=3, max_length=160, description="Lesson title")
     content: Optional[str] = Field(None, description="Lesson content (markdown or text)")
-    video_url: Optional[HttpUrl] = Field(None, description="Public video URL if available")
+    video_url: Optional[str] = Field(None, max_length=2083, description="Public video URL if available")
     order: int = Field(1, ge=1, description="Ordering within course")
 
+    @field_validator("video_url")
+    @classmethod
+    def validate_video_url(cls, value: Optional[str]) -> Optional[str]:
+        return check_http_url(value)
+
 class Enrollment(BaseModel):
     """
     Enrollments collection schema
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+import main
+
+
+class FakeDatabase:
+    def __init__(self, error=None):
+        self.calls = 0
+        self.error = error
+
+    async def list_collection_names(self):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return ["course", "lesson"]
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeDatabase()
+    monkeypatch.setattr(main, "db", db)
+    monkeypatch.setattr(main, "_collections_cache", (0.0, None))
+    return db
+
+
+def test_list_collections_cached_within_ttl(fake_db):
+    async def call_twice():
+        return await main.list_collections_cached(), await main.list_collections_cached()
+
+    first, second = asyncio.run(call_twice())
+    assert first == second == ["course", "lesson"]
+    assert fake_db.calls == 1
+
+
+def test_list_collections_cached_refreshes_after_ttl(fake_db, monkeypatch):
+    asyncio.run(main.list_collections_cached())
+    ts, collections = main._collections_cache
+    monkeypatch.setattr(main, "_collections_cache", (ts - main.COLLECTIONS_CACHE_TTL - 1, collections))
+
+    asyncio.run(main.list_collections_cached())
+    assert fake_db.calls == 2
+
+
+def test_list_collections_cached_does_not_cache_errors(fake_db):
+    fake_db.error = RuntimeError("boom")
+    with pytest.raises(RuntimeError):
+        asyncio.run(main.list_collections_cached())
+    assert main._collections_cache == (0.0, None)
+
+    fake_db.error = None
+    assert asyncio.run(main.list_collections_cached()) == ["course", "lesson"]
+    assert fake_db.calls == 2
+
+
+@pytest.fixture
+def client(monkeypatch):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    from fastapi.testclient import TestClient
+
+    import database
+
+    mock_db = mongomock_motor.AsyncMongoMockClient()["test"]
+    monkeypatch.setattr(database, "db", mock_db)
+    monkeypatch.setattr(main, "db", mock_db)
+    # Not entered as a context manager, so the lifespan (index creation) does not run
+    return TestClient(main.app)
+
+
+def test_text_search_terms_strips_operators():
+    assert main.text_search_terms('"ui design" -python') == "ui design python"
+
+
+def test_search_courses_without_text_index_matches_substring(client, monkeypatch):
+    monkeypatch.setattr(main, "text_search_enabled", False)
+    client.post("/api/seed")
+
+    titles = [c["title"] for c in client.get("/api/courses", params={"search": "thon"}).json()]
+    assert titles == ["Python for Beginners"]
+    assert client.get("/api/courses", params={"search": "(python"}).json() == []
+
+
+@pytest.mark.parametrize("count", [0, 1, 3, 7])
+def test_list_courses_streams_json_array(client, monkeypatch, count):
+    monkeypatch.setattr(main, "STREAM_BATCH_SIZE", 3)
+    docs = [
+        {
+            "title": f"Course {i}",
+            "description": "A course description",
+            "category": "Programming",
+            "level": "Beginner",
+            "author": "Jane Doe",
+        }
+        for i in range(count)
+    ]
+    if docs:
+        asyncio.run(main.db["course"].insert_many(docs))
+
+    response = client.get("/api/courses")
+    assert response.status_code == 200
+    courses = response.json()
+    assert [c["title"] for c in courses] == [f"Course {i}" for i in range(count)]
+    assert len({c["id"] for c in courses}) == count